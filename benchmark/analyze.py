@@ -1,117 +1,242 @@
 #!/usr/bin/env python3
 
-import glob
-import json
 import os
 import platform
 import socket
 import subprocess
-from collections import defaultdict
+import zipfile
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
+from string import Template
+
+import numpy as np
 
 from charts import render_mode_charts
 
+try:
+    import orjson as _json
+except ImportError:
+    import json as _json
+
 ROOT = Path(__file__).resolve().parent.parent
 RESULTS_DIR = ROOT / "results"
 CHARTS_DIR = RESULTS_DIR / "charts"
 TEMPLATE_FILE = ROOT / "benchmark" / "report_template.md"
 SUMMARY_FILE = RESULTS_DIR / "BENCHMARK_SUMMARY.md"
 REPORT_FILE = RESULTS_DIR / "BENCHMARK_REPORT.md"
+CACHE_FILE_NAME = ".cache.npz"
+# Bump whenever _load_one or COLUMN_DTYPES change how results are parsed.
+CACHE_VERSION = 1
+
+Groupings = namedtuple("Groupings", "columns by_mode by_mpw")
+
+COLUMN_DTYPES = {
+    "file": str,
+    "protocol": str,
+    "mode": str,
+    "work_factor": "i4",
+    "payload_size_bytes": "i4",
+    "concurrency": "i4",
+    "duration_seconds": "f4",
+    "rps": "f8",
+    "p50": "f8",
+    "p90": "f4",
+    "p95": "f8",
+    "p99": "f8",
+    "mean": "f8",
+    "max": "f4",
+    "error_rate": "f8",
+    "timestamp": str,
+}
+
+SUMMARY_FIELDS = ("protocol", "concurrency", "rps", "p50", "p95", "p99", "mean", "error_rate")
+SUMMARY_ROW_FORMAT = "| %s | %s | %.2f | %.2f | %.2f | %.2f | %.2f | %.2f%% |\n"
+
+
+def _load_one(file_path: str):
+    with open(file_path, "rb") as file_handle:
+        payload = _json.loads(file_handle.read())
+    stats = payload.get("stats", {})
+    # One value per COLUMN_DTYPES entry, in the same order.
+    return (
+        os.path.basename(file_path),
+        payload.get("protocol"),
+        payload.get("mode"),
+        payload.get("work_factor") or 0,
+        payload.get("payload_size_bytes") or 0,
+        payload.get("concurrency") or 0,
+        payload.get("duration_seconds"),
+        stats.get("rps", 0.0),
+        stats.get("p50", 0.0),
+        stats.get("p90", 0.0),
+        stats.get("p95", 0.0),
+        stats.get("p99", 0.0),
+        stats.get("mean", 0.0),
+        stats.get("max", 0.0),
+        stats.get("error_rate", 0.0),
+        payload.get("timestamp", ""),
+    )
+
+
+def _read_cache(cache_file: Path, names, stats):
+    try:
+        with open(cache_file, "rb") as fh, np.load(fh, allow_pickle=False) as data:
+            if data["version"] != CACHE_VERSION:
+                return None
+            if data["names"].tolist() != names or data["stats"].tolist() != stats:
+                return None
+            table = data["table"]
+            return {name: np.ascontiguousarray(table[name]) for name in COLUMN_DTYPES}
+    except (OSError, EOFError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
+
+
+def _write_cache(cache_file: Path, names, stats, columns) -> None:
+    table = np.empty(len(columns["file"]), dtype=[(name, column.dtype) for name, column in columns.items()])
+    for name, column in columns.items():
+        table[name] = column
+    tmp_file = cache_file.with_name(cache_file.name + ".tmp")
+    try:
+        with open(tmp_file, "wb") as file_handle:
+            np.savez(
+                file_handle,
+                version=np.array(CACHE_VERSION),
+                names=np.array(names),
+                stats=np.array(stats, dtype="i8"),
+                table=table,
+            )
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
 
 
 def load_rows(results_dir: Path):
-    rows = []
-    for file_path in glob.glob(str(results_dir / "*.json")):
-        with open(file_path, "r", encoding="utf-8") as file_handle:
-            payload = json.load(file_handle)
-        stats = payload.get("stats", {})
-        rows.append(
-            {
-                "file": os.path.basename(file_path),
-                "protocol": payload.get("protocol"),
-                "mode": payload.get("mode"),
-                "work_factor": payload.get("work_factor"),
-                "payload_size_bytes": payload.get("payload_size_bytes"),
-                "concurrency": payload.get("concurrency"),
-                "duration_seconds": payload.get("duration"),
-                "rps": stats.get("rps", 0.0),
-                "p50": stats.get("p50", 0.0),
-                "p90": stats.get("p90", 0.0),
-                "p95": stats.get("p95", 0.0),
-                "p99": stats.get("p99", 0.0),
-                "mean": stats.get("mean", 0.0),
-                "max": stats.get("max", 0.0),
-                "error_rate": stats.get("error_rate", 0.0),
-                "timestamp": payload.get("timestamp", ""),
-            }
+    files = {}
+    try:
+        with os.scandir(results_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json") and not entry.name.startswith(".") and entry.is_file():
+                    stat = entry.stat()
+                    files[entry.name] = (entry.path, [stat.st_size, stat.st_mtime_ns, stat.st_ctime_ns])
+    except FileNotFoundError:
+        return {}
+    if not files:
+        return {}
+
+    names = sorted(files)
+    stats = [files[name][1] for name in names]
+    cache_file = results_dir / CACHE_FILE_NAME
+    columns = _read_cache(cache_file, names, stats)
+    if columns is not None:
+        return columns
+
+    paths = [files[name][0] for name in names]
+    with ThreadPoolExecutor(max_workers=min(32, len(paths), (os.cpu_count() or 1) * 4)) as executor:
+        rows = list(executor.map(_load_one, paths))
+    columns = {
+        name: np.array(values, dtype=dtype) for (name, dtype), values in zip(COLUMN_DTYPES.items(), zip(*rows))
+    }
+    _write_cache(cache_file, names, stats, columns)
+    return columns
+
+
+def sort_rows(columns):
+    """Return columns reordered by (mode, payload, protocol, concurrency, work_factor).
+
+    group_rows, write_summary and the chart renderer rely on this order and do not re-sort.
+    """
+    order = np.lexsort(
+        (
+            columns["work_factor"],
+            columns["concurrency"],
+            columns["protocol"],
+            columns["payload_size_bytes"],
+            columns["mode"],
         )
-    return rows
-
-
-def write_summary(rows, output_file: Path):
-    grouped = defaultdict(list)
-    for row in rows:
-        grouped[(row["mode"], row["payload_size_bytes"], row["work_factor"])].append(row)
-
-    lines = ["# Benchmark Summary", ""]
-    for key in sorted(grouped.keys()):
-        mode, payload_size, work_factor = key
-        lines.append(f"## mode={mode}, payload={payload_size}, work_factor={work_factor}")
-        lines.append("")
-        lines.append("| protocol | concurrency | rps | p50 | p95 | p99 | mean | error_rate |")
-        lines.append("|---|---:|---:|---:|---:|---:|---:|---:|")
-
-        for row in sorted(grouped[key], key=lambda item: (item["protocol"], item["concurrency"])):
-            lines.append(
-                f"| {row['protocol']} | {row['concurrency']} | {row['rps']:.2f} | {row['p50']:.2f} | "
-                f"{row['p95']:.2f} | {row['p99']:.2f} | {row['mean']:.2f} | {row['error_rate'] * 100:.2f}% |"
-            )
-        lines.append("")
+    )
+    return {name: column[order] for name, column in columns.items()}
+
 
-    output_file.write_text("\n".join(lines), encoding="utf-8")
+def group_rows(columns):
+    modes, mode_starts = np.unique(columns["mode"], return_index=True)
+    mode_bounds = list(mode_starts[1:]) + [len(columns["mode"])]
+    by_mode = {
+        mode: np.arange(start, stop) for mode, start, stop in zip(modes.tolist(), mode_starts, mode_bounds)
+    }
 
+    keys = np.empty(len(columns["mode"]), dtype=[("mode", columns["mode"].dtype), ("payload", "i4"), ("wf", "i4")])
+    keys["mode"] = columns["mode"]
+    keys["payload"] = columns["payload_size_bytes"]
+    keys["wf"] = columns["work_factor"]
+    unique_keys, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.ravel()
+    order = np.argsort(inverse, kind="stable")
+    splits = np.cumsum(np.bincount(inverse))[:-1]
+    by_mpw = {key.item(): indices for key, indices in zip(unique_keys, np.split(order, splits))}
 
-def generate_observations(rows):
-    by_mode = defaultdict(list)
-    for row in rows:
-        by_mode[row["mode"]].append(row)
+    return Groupings(columns, by_mode, by_mpw)
 
+
+def write_summary(groupings: Groupings, output_file: Path):
+    columns = groupings.columns
+    grouped = groupings.by_mpw
+    with output_file.open("w", encoding="utf-8", buffering=1 << 20) as file_handle:
+        file_handle.write("# Benchmark Summary\n")
+        for key in sorted(grouped.keys()):
+            mode, payload_size, work_factor = key
+            file_handle.write(
+                f"\n## mode={mode}, payload={payload_size}, work_factor={work_factor}\n\n"
+                "| protocol | concurrency | rps | p50 | p95 | p99 | mean | error_rate |\n"
+                "|---|---:|---:|---:|---:|---:|---:|---:|\n"
+            )
+            fields = [columns[name][grouped[key]] for name in SUMMARY_FIELDS]
+            fields[-1] = fields[-1] * 100
+            file_handle.writelines(SUMMARY_ROW_FORMAT % row for row in zip(*(field.tolist() for field in fields)))
+
+
+def generate_observations(groupings: Groupings):
+    columns = groupings.columns
+    protocol, concurrency = columns["protocol"], columns["concurrency"]
+    rps, p95, error_rate = columns["rps"], columns["p95"], columns["error_rate"]
     bullets = []
-    for mode, mode_rows in sorted(by_mode.items()):
-        best_rps = max(mode_rows, key=lambda item: item["rps"])
-        best_p95 = min(mode_rows, key=lambda item: item["p95"])
-        lowest_error = min(mode_rows, key=lambda item: item["error_rate"])
+    for mode, indices in sorted(groupings.by_mode.items()):
+        best_rps = indices[np.argmax(rps[indices])]
+        best_p95 = indices[np.argmin(p95[indices])]
+        lowest_error = indices[np.argmin(error_rate[indices])]
         bullets.append(
-            f"- {mode.upper()}: highest throughput from `{best_rps['protocol']}` at concurrency={best_rps['concurrency']} "
-            f"(rps={best_rps['rps']:.2f})."
+            f"- {mode.upper()}: highest throughput from `{protocol[best_rps]}` at concurrency={concurrency[best_rps]} "
+            f"(rps={rps[best_rps]:.2f})."
         )
         bullets.append(
-            f"- {mode.upper()}: lowest p95 latency from `{best_p95['protocol']}` at concurrency={best_p95['concurrency']} "
-            f"(p95={best_p95['p95']:.2f} ms)."
+            f"- {mode.upper()}: lowest p95 latency from `{protocol[best_p95]}` at concurrency={concurrency[best_p95]} "
+            f"(p95={p95[best_p95]:.2f} ms)."
         )
         bullets.append(
-            f"- {mode.upper()}: lowest error rate from `{lowest_error['protocol']}` at concurrency={lowest_error['concurrency']} "
-            f"(error={lowest_error['error_rate'] * 100:.2f}%)."
+            f"- {mode.upper()}: lowest error rate from `{protocol[lowest_error]}` at concurrency={concurrency[lowest_error]} "
+            f"(error={error_rate[lowest_error] * 100:.2f}%)."
         )
 
     return "\n".join(bullets)
 
 
-def generate_tradeoffs(rows):
-    protocols = sorted({row["protocol"] for row in rows})
+def generate_tradeoffs(groupings: Groupings):
+    columns = groupings.columns
     lines = []
-    for protocol in protocols:
-        protocol_rows = [row for row in rows if row["protocol"] == protocol]
-        avg_rps = sum(r["rps"] for r in protocol_rows) / len(protocol_rows)
-        avg_p95 = sum(r["p95"] for r in protocol_rows) / len(protocol_rows)
-        avg_err = (sum(r["error_rate"] for r in protocol_rows) / len(protocol_rows)) * 100.0
+    for protocol in np.unique(columns["protocol"]):
+        mask = columns["protocol"] == protocol
+        avg_rps = columns["rps"][mask].mean()
+        avg_p95 = columns["p95"][mask].mean()
+        avg_err = columns["error_rate"][mask].mean() * 100.0
         lines.append(
             f"- `{protocol}`: average rps={avg_rps:.2f}, average p95={avg_p95:.2f} ms, average error={avg_err:.2f}%."
         )
     return "\n".join(lines)
 
 
+@lru_cache(maxsize=1)
 def read_go_version():
     try:
         out = subprocess.check_output(["go", "version"], stderr=subprocess.STDOUT, text=True)
@@ -120,38 +245,40 @@ def read_go_version():
         return "unknown"
 
 
-def write_report(rows, output_file: Path):
-    template = TEMPLATE_FILE.read_text(encoding="utf-8")
-    cpu_work_factors = sorted({row["work_factor"] for row in rows if row["mode"] == "cpu"})
-    io_work_factors = sorted({row["work_factor"] for row in rows if row["mode"] == "io"})
+@lru_cache(maxsize=1)
+def read_report_template():
+    return Template(TEMPLATE_FILE.read_text(encoding="utf-8"))
 
-    report = template.format(
+
+def write_report(groupings: Groupings, output_file: Path):
+    cpu_work_factors = sorted({wf for mode, _, wf in groupings.by_mpw if mode == "cpu"})
+    io_work_factors = sorted({wf for mode, _, wf in groupings.by_mpw if mode == "io"})
+
+    report = read_report_template().substitute(
         date=datetime.now(UTC).strftime("%Y-%m-%d"),
         host=socket.gethostname(),
         go_version=read_go_version(),
         python_version=platform.python_version(),
         cpu_work_factors=", ".join(str(x) for x in cpu_work_factors) or "n/a",
         io_work_factors=", ".join(str(x) for x in io_work_factors) or "n/a",
-        observations=generate_observations(rows),
-        tradeoffs=generate_tradeoffs(rows),
+        observations=generate_observations(groupings),
+        tradeoffs=generate_tradeoffs(groupings),
     )
     output_file.write_text(report, encoding="utf-8")
 
 
 def main():
-    rows = load_rows(RESULTS_DIR)
-    if not rows:
+    columns = load_rows(RESULTS_DIR)
+    if not columns:
         raise SystemExit("No result files found in results/")
 
-    grouped = defaultdict(list)
-    for row in rows:
-        grouped[row["mode"]].append(row)
-
-    generated = render_mode_charts(grouped, str(CHARTS_DIR))
-    write_summary(rows, SUMMARY_FILE)
-    write_report(rows, REPORT_FILE)
+    columns = sort_rows(columns)
+    groupings = group_rows(columns)
+    generated = render_mode_charts(columns, groupings.by_mode, str(CHARTS_DIR))
+    write_summary(groupings, SUMMARY_FILE)
+    write_report(groupings, REPORT_FILE)
 
-    print(f"Loaded {len(rows)} result files")
+    print(f"Loaded {len(columns['file'])} result files")
     print(f"Generated {len(generated)} chart files in {CHARTS_DIR}")
     print(f"Wrote summary: {SUMMARY_FILE}")
     print(f"Wrote report: {REPORT_FILE}")
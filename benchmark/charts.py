@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 
+import multiprocessing
 import os
 from typing import Dict, List
 
@@ -7,56 +8,110 @@ import matplotlib
 
 matplotlib.use("Agg")
 import matplotlib.pyplot as plt
+import numpy as np
+from matplotlib.collections import LineCollection
+from matplotlib.lines import Line2D
 
+matplotlib.rcParams.update(
+    {
+        "text.usetex": False,
+        "mathtext.default": "regular",
+        "path.simplify": True,
+        "path.simplify_threshold": 1.0,
+        "agg.path.chunksize": 10000,
+        "figure.autolayout": False,
+    }
+)
 
-def render_mode_charts(grouped_rows: Dict[str, List[dict]], output_dir: str) -> List[str]:
+
+_figure = None
+
+
+def _init_worker() -> None:
+    global _figure
+    matplotlib.use("Agg")
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+    fig.subplots_adjust(left=0.06, right=0.98, bottom=0.06, top=0.92, wspace=0.15, hspace=0.25)
+    _figure = (fig, axes)
+
+
+CHART_COLUMNS = ("protocol", "concurrency", "rps", "p95", "p99", "error_rate")
+
+
+def render_mode_charts(
+    columns: Dict[str, np.ndarray], mode_indices: Dict[str, np.ndarray], output_dir: str
+) -> List[str]:
+    """Render one chart per (mode, payload).
+
+    Columns must already be sorted by (mode, payload_size_bytes, protocol, concurrency).
+    """
     os.makedirs(output_dir, exist_ok=True)
-    generated = []
-
-    for mode, rows in grouped_rows.items():
-        protocols = sorted({row["protocol"] for row in rows})
-        payloads = sorted({row["payload_size_bytes"] for row in rows})
-
-        for payload in payloads:
-            payload_rows = [r for r in rows if r["payload_size_bytes"] == payload]
-            fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-            fig.suptitle(f"{mode.upper()} mode, payload={payload}B", fontsize=14)
-
-            _plot_metric(axes[0][0], payload_rows, protocols, "rps", "Throughput vs Concurrency", "RPS")
-            _plot_metric(axes[0][1], payload_rows, protocols, "p95", "p95 Latency vs Concurrency", "Latency (ms)")
-            _plot_metric(axes[1][0], payload_rows, protocols, "p99", "p99 Latency vs Concurrency", "Latency (ms)")
-
-            err_rows = []
-            for row in payload_rows:
-                copied = dict(row)
-                copied["error_rate"] = copied["error_rate"] * 100.0
-                err_rows.append(copied)
-            _plot_metric(axes[1][1], err_rows, protocols, "error_rate", "Error Rate vs Concurrency", "Error rate (%)")
-
-            plt.tight_layout()
-            out_file = os.path.join(output_dir, f"{mode}_payload_{payload}.png")
-            fig.savefig(out_file, dpi=150)
-            plt.close(fig)
-            generated.append(out_file)
-
-    return generated
-
-
-def _plot_metric(ax, rows: List[dict], protocols: List[str], metric_key: str, title: str, ylabel: str) -> None:
-    markers = ["o", "s", "^", "d", "x"]
-    for idx, protocol in enumerate(protocols):
-        points = sorted(
-            [row for row in rows if row["protocol"] == protocol],
-            key=lambda item: item["concurrency"],
-        )
-        if not points:
+    tasks = _chart_tasks(columns, mode_indices, output_dir)
+    if not tasks:
+        return []
+
+    processes = min(os.cpu_count() or 1, len(tasks))
+    with multiprocessing.Pool(processes=processes, initializer=_init_worker) as pool:
+        return pool.starmap(_render_one, tasks)
+
+
+def _chart_tasks(columns: Dict[str, np.ndarray], mode_indices: Dict[str, np.ndarray], output_dir: str) -> list:
+    tasks = []
+    for mode, indices in mode_indices.items():
+        protocols = np.unique(columns["protocol"][indices]).tolist()
+        payloads, starts = np.unique(columns["payload_size_bytes"][indices], return_index=True)
+
+        for payload, payload_indices in zip(payloads.tolist(), np.split(indices, starts[1:])):
+            payload_columns = {name: columns[name][payload_indices] for name in CHART_COLUMNS}
+            tasks.append((mode, payload, payload_columns, protocols, output_dir))
+    return tasks
+
+
+def _render_one(
+    mode: str, payload: int, payload_columns: Dict[str, np.ndarray], protocols: List[str], output_dir: str
+) -> str:
+    fig, axes = _figure
+    for ax in axes.flat:
+        ax.clear()
+    fig.suptitle(f"{mode.upper()} mode, payload={payload}B", fontsize=14)
+
+    _plot_metric(axes[0][0], payload_columns, protocols, "rps", "Throughput vs Concurrency", "RPS")
+    _plot_metric(axes[0][1], payload_columns, protocols, "p95", "p95 Latency vs Concurrency", "Latency (ms)")
+    _plot_metric(axes[1][0], payload_columns, protocols, "p99", "p99 Latency vs Concurrency", "Latency (ms)")
+    _plot_metric(
+        axes[1][1], payload_columns, protocols, "error_rate", "Error Rate vs Concurrency", "Error rate (%)", scale=100.0
+    )
+
+    out_file = os.path.join(output_dir, f"{mode}_payload_{payload}.png")
+    fig.savefig(out_file, dpi=100, format="png", pil_kwargs={"compress_level": 1, "optimize": False})
+    return out_file
+
+
+def _plot_metric(
+    ax, columns: Dict[str, np.ndarray], protocols: List[str], metric_key: str, title: str, ylabel: str, scale: float = 1.0
+) -> None:
+    palette = matplotlib.rcParams["axes.prop_cycle"].by_key()["color"]
+    segments = []
+    colors = []
+    handles = []
+    for protocol in protocols:
+        mask = columns["protocol"] == protocol
+        if not mask.any():
             continue
-        x = [p["concurrency"] for p in points]
-        y = [p[metric_key] for p in points]
-        ax.plot(x, y, marker=markers[idx % len(markers)], linewidth=2, label=protocol)
+        color = palette[len(segments) % len(palette)]
+        segments.append(np.column_stack([columns["concurrency"][mask], columns[metric_key][mask] * scale]))
+        colors.append(color)
+        handles.append(Line2D([], [], color=color, marker="o", linewidth=2, label=protocol))
+
+    if segments:
+        ax.add_collection(LineCollection(segments, colors=colors, linewidths=2))
+        xy = np.concatenate(segments)
+        point_colors = [color for color, seg in zip(colors, segments) for _ in seg]
+        ax.scatter(xy[:, 0], xy[:, 1], c=point_colors, marker="o", zorder=3)
+        ax.autoscale_view()
 
     ax.set_title(title)
     ax.set_xlabel("Concurrency")
     ax.set_ylabel(ylabel)
     ax.grid(True, alpha=0.3)
-    ax.legend()
+    ax.legend(handles=handles)
@@ -0,0 +1,204 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from pathlib import Path
+
+import analyze
+import charts
+
+# protocol, mode, payload_size_bytes, work_factor, concurrency, rps, p50, p95, p99, mean, error_rate.
+# Latencies are whole microseconds in ms, as the load generator records them, so many sit on %.2f ties.
+RESULTS = [
+    ("rest", "cpu", 256, 100, 10, 1234.565, 3.105, 4.215, 6.005, 3.5, 0.0125),
+    ("rest", "cpu", 256, 100, 1, 812.335, 1.225, 1.845, 2.415, 1.305, 0.0),
+    ("grpc", "cpu", 256, 100, 1, 930.125, 0.985, 1.395, 89.485, 1.115, 0.0005),
+    ("rest", "cpu", 256, 1000, 1, 95.005, 10.515, 12.125, 14.735, 10.995, 0.0),
+    ("grpc", "cpu", 4096, 100, 1, 701.5, 1.405, 46.515, 52.605, 1.625, 0.002),
+    ("jsonrpc", "io", 256, 5, 1, 180.245, 5.535, 6.065, 6.925, 5.625, 0.0),
+    ("rest", "io", 256, 5, 1, 182.775, 5.445, 5.985, 6.815, 5.555, 0.001),
+    ("grpc", "io", 4096, 5, 10, 1650.095, 6.015, 7.245, 9.105, 6.125, 0.0375),
+]
+
+SORTED_FILES = [
+    "grpc_cpu_c1_p256_wf100.json",
+    "rest_cpu_c1_p256_wf100.json",
+    "rest_cpu_c1_p256_wf1000.json",
+    "rest_cpu_c10_p256_wf100.json",
+    "grpc_cpu_c1_p4096_wf100.json",
+    "jsonrpc_io_c1_p256_wf5.json",
+    "rest_io_c1_p256_wf5.json",
+    "grpc_io_c10_p4096_wf5.json",
+]
+
+# Output of the list-of-dicts implementation for RESULTS.
+EXPECTED_SUMMARY = """# Benchmark Summary
+
+## mode=cpu, payload=256, work_factor=100
+
+| protocol | concurrency | rps | p50 | p95 | p99 | mean | error_rate |
+|---|---:|---:|---:|---:|---:|---:|---:|
+| grpc | 1 | 930.12 | 0.98 | 1.40 | 89.48 | 1.11 | 0.05% |
+| rest | 1 | 812.34 | 1.23 | 1.84 | 2.42 | 1.30 | 0.00% |
+| rest | 10 | 1234.57 | 3.10 | 4.21 | 6.00 | 3.50 | 1.25% |
+
+## mode=cpu, payload=256, work_factor=1000
+
+| protocol | concurrency | rps | p50 | p95 | p99 | mean | error_rate |
+|---|---:|---:|---:|---:|---:|---:|---:|
+| rest | 1 | 95.00 | 10.52 | 12.12 | 14.73 | 10.99 | 0.00% |
+
+## mode=cpu, payload=4096, work_factor=100
+
+| protocol | concurrency | rps | p50 | p95 | p99 | mean | error_rate |
+|---|---:|---:|---:|---:|---:|---:|---:|
+| grpc | 1 | 701.50 | 1.41 | 46.52 | 52.60 | 1.62 | 0.20% |
+
+## mode=io, payload=256, work_factor=5
+
+| protocol | concurrency | rps | p50 | p95 | p99 | mean | error_rate |
+|---|---:|---:|---:|---:|---:|---:|---:|
+| jsonrpc | 1 | 180.25 | 5.54 | 6.07 | 6.92 | 5.62 | 0.00% |
+| rest | 1 | 182.78 | 5.45 | 5.99 | 6.82 | 5.55 | 0.10% |
+
+## mode=io, payload=4096, work_factor=5
+
+| protocol | concurrency | rps | p50 | p95 | p99 | mean | error_rate |
+|---|---:|---:|---:|---:|---:|---:|---:|
+| grpc | 10 | 1650.10 | 6.01 | 7.25 | 9.11 | 6.12 | 3.75% |
+"""
+
+
+def write_results(results_dir: Path) -> None:
+    for protocol, mode, payload_size, work_factor, concurrency, rps, p50, p95, p99, mean, error_rate in RESULTS:
+        payload = {
+            "protocol": protocol,
+            "mode": mode,
+            "work_factor": work_factor,
+            "payload_size_bytes": payload_size,
+            "concurrency": concurrency,
+            "stats": {"rps": rps, "p50": p50, "p95": p95, "p99": p99, "mean": mean, "error_rate": error_rate},
+        }
+        file_name = f"{protocol}_{mode}_c{concurrency}_p{payload_size}_wf{work_factor}.json"
+        (results_dir / file_name).write_text(json.dumps(payload), encoding="utf-8")
+
+
+class LoadRowsTest(unittest.TestCase):
+    def test_missing_integer_fields_default_to_zero(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            results_dir = Path(tmp)
+            for protocol in ("rest", "grpc"):
+                payload = {"protocol": protocol, "mode": "cpu", "stats": {"rps": 10.0}}
+                (results_dir / f"{protocol}.json").write_text(json.dumps(payload), encoding="utf-8")
+
+            columns = analyze.load_rows(results_dir)
+
+        self.assertEqual(sorted(columns["protocol"].tolist()), ["grpc", "rest"])
+        self.assertEqual(columns["work_factor"].tolist(), [0, 0])
+        self.assertEqual(columns["payload_size_bytes"].tolist(), [0, 0])
+        self.assertEqual(columns["concurrency"].tolist(), [0, 0])
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.results_dir = Path(tmp.name)
+        self.result_file = self.results_dir / "rest.json"
+        self.write_rps(10.0)
+
+    def write_rps(self, rps):
+        payload = {"protocol": "rest", "mode": "cpu", "concurrency": 1, "stats": {"rps": rps}}
+        self.result_file.write_text(json.dumps(payload), encoding="utf-8")
+
+    def load_rps(self):
+        with mock.patch.object(analyze, "_load_one", wraps=analyze._load_one) as load_one:
+            rps = analyze.load_rows(self.results_dir)["rps"].tolist()
+        return rps, load_one.called
+
+    def test_unchanged_results_are_served_from_cache(self):
+        self.assertEqual(self.load_rps(), ([10.0], True))
+        self.assertEqual(self.load_rps(), ([10.0], False))
+
+    def test_cache_from_another_version_is_ignored(self):
+        self.load_rps()
+        with mock.patch.object(analyze, "CACHE_VERSION", analyze.CACHE_VERSION + 1):
+            self.assertEqual(self.load_rps(), ([10.0], True))
+
+    def test_rewritten_file_with_restored_mtime_is_reparsed(self):
+        self.load_rps()
+        stat = self.result_file.stat()
+        self.write_rps(20.0)
+        os.utime(self.result_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertEqual(self.result_file.stat().st_size, stat.st_size)
+
+        self.assertEqual(self.load_rps(), ([20.0], True))
+
+    def test_damaged_cache_is_a_miss(self):
+        self.load_rps()
+        (self.results_dir / analyze.CACHE_FILE_NAME).write_bytes(b"PK\x03\x04 not a zip")
+        self.assertEqual(self.load_rps(), ([10.0], True))
+
+
+class GroupingTest(unittest.TestCase):
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.results_dir = Path(tmp.name)
+        write_results(self.results_dir)
+        self.columns = analyze.sort_rows(analyze.load_rows(self.results_dir))
+        self.groupings = analyze.group_rows(self.columns)
+
+    def files(self, indices):
+        return self.columns["file"][indices].tolist()
+
+    def test_sort_rows_orders_by_mode_payload_protocol_concurrency_work_factor(self):
+        self.assertEqual(self.columns["file"].tolist(), SORTED_FILES)
+
+    def test_group_rows_indices(self):
+        by_mode = self.groupings.by_mode
+        self.assertEqual(sorted(by_mode), ["cpu", "io"])
+        self.assertEqual(by_mode["cpu"].tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(by_mode["io"].tolist(), [5, 6, 7])
+
+        by_mpw = {key: indices.tolist() for key, indices in self.groupings.by_mpw.items()}
+        self.assertEqual(
+            by_mpw,
+            {
+                ("cpu", 256, 100): [0, 1, 3],
+                ("cpu", 256, 1000): [2],
+                ("cpu", 4096, 100): [4],
+                ("io", 256, 5): [5, 6],
+                ("io", 4096, 5): [7],
+            },
+        )
+        self.assertEqual(
+            self.files(self.groupings.by_mpw[("cpu", 256, 100)]),
+            ["grpc_cpu_c1_p256_wf100.json", "rest_cpu_c1_p256_wf100.json", "rest_cpu_c10_p256_wf100.json"],
+        )
+
+    def test_write_summary_matches_previous_output(self):
+        summary_file = self.results_dir / "BENCHMARK_SUMMARY.md"
+        analyze.write_summary(self.groupings, summary_file)
+        self.assertEqual(summary_file.read_text(encoding="utf-8"), EXPECTED_SUMMARY)
+
+    def test_chart_tasks_split_each_mode_by_payload(self):
+        tasks = charts._chart_tasks(self.columns, self.groupings.by_mode, "out")
+        summary = [
+            (mode, payload, protocols, columns["protocol"].tolist(), columns["concurrency"].tolist())
+            for mode, payload, columns, protocols, _ in tasks
+        ]
+        self.assertEqual(
+            summary,
+            [
+                ("cpu", 256, ["grpc", "rest"], ["grpc", "rest", "rest", "rest"], [1, 1, 1, 10]),
+                ("cpu", 4096, ["grpc", "rest"], ["grpc"], [1]),
+                ("io", 256, ["grpc", "jsonrpc", "rest"], ["jsonrpc", "rest"], [1, 1]),
+                ("io", 4096, ["grpc", "jsonrpc", "rest"], ["grpc"], [10]),
+            ],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()